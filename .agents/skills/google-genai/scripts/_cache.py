@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Shared in-process response cache for the example scripts.
+Keyed by (model_name, prompt) and bounded as an LRU; opt in with MECHAT_CACHE=1.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+_CACHE_SIZE = 512
+_CACHE: OrderedDict[tuple[str, str], str] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    """Response caching is opt-in via MECHAT_CACHE=1."""
+    return os.getenv("MECHAT_CACHE") == "1"
+
+
+def cache_get(key: tuple[str, str]) -> str | None:
+    with _CACHE_LOCK:
+        text = _CACHE.get(key)
+        if text is not None:
+            _CACHE.move_to_end(key)
+        return text
+
+
+def cache_put(key: tuple[str, str], text: str) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = text
+        _CACHE.move_to_end(key)
+        if len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
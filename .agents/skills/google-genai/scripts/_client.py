@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Shared Gemini client for the example scripts.
+Keeps one client per process with a tuned keep-alive connection pool, and
+retries transient API failures with jittered exponential backoff.
+"""
+
+import asyncio
+import importlib.util
+import os
+import random
+import threading
+import time
+import weakref
+import httpx
+from google import genai
+from google.genai import errors, types
+
+# HTTP/2 lets concurrent client.aio calls share one connection; it needs the
+# optional h2 package (pip install "httpx[http2]").
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Keep idle sockets around between bursty chat turns instead of httpx's 5s
+# default, so follow-up requests skip the TCP/TLS handshake.
+_LIMITS = httpx.Limits(
+    max_connections=128,
+    max_keepalive_connections=64,
+    keepalive_expiry=85.0,
+)
+
+# Hand out a fresh client (and pool) after this many seconds so long-lived
+# processes re-resolve DNS and do not stay pinned to one load-balancer backend.
+# Rotated-out clients are not closed: chats and streams may still hold them,
+# and they are released by garbage collection once nothing does.
+MAX_POOL_AGE = float(os.getenv("MECHAT_MAX_POOL_AGE", "600"))
+
+# One client for callers outside an event loop, plus one per running loop:
+# client.aio binds pooled connections to the loop that opened them.
+_SYNC_CLIENT: tuple[genai.Client, float] | None = None
+_LOOP_CLIENTS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_CLIENT_LOCK = threading.Lock()
+
+_TRANSIENT_STATUS = frozenset({429, 500, 502, 503, 504})
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _http_options() -> types.HttpOptions:
+    # The SDK leaves caller-supplied httpx clients open when a genai.Client is
+    # garbage collected, so chats built from a rotated-out client keep working.
+    # Supplying the async one also keeps client.aio on httpx when aiohttp
+    # happens to be installed, so both paths get the same pool settings.
+    return types.HttpOptions(
+        timeout=60_000,
+        httpx_client=httpx.Client(
+            http2=_HTTP2, limits=_LIMITS, follow_redirects=True
+        ),
+        httpx_async_client=httpx.AsyncClient(
+            http2=_HTTP2, limits=_LIMITS, follow_redirects=True
+        ),
+    )
+
+
+def _expired(entry: tuple[genai.Client, float] | None) -> bool:
+    return entry is None or time.monotonic() - entry[1] > MAX_POOL_AGE
+
+
+def get_client() -> genai.Client:
+    """
+    Return the shared client for the calling context, rotating it after
+    MAX_POOL_AGE seconds.
+
+    Inside a running event loop this is a client owned by that loop, so
+    client.aio connections are never reused from another loop (e.g. across
+    separate asyncio.run calls or the run_sync loop). Create async chats and
+    other long-lived async objects from within the loop that will use them.
+    """
+    global _SYNC_CLIENT
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    entry = _SYNC_CLIENT if loop is None else _LOOP_CLIENTS.get(loop)
+    if _expired(entry):
+        with _CLIENT_LOCK:
+            entry = _SYNC_CLIENT if loop is None else _LOOP_CLIENTS.get(loop)
+            if _expired(entry):
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY environment variable not set")
+                client = genai.Client(api_key=api_key, http_options=_http_options())
+                entry = (client, time.monotonic())
+                if loop is None:
+                    _SYNC_CLIENT = entry
+                else:
+                    # Pooled sockets reference their loop, which would keep a
+                    # closed loop's entry alive; drop those explicitly.
+                    for stale in [l for l in _LOOP_CLIENTS if l.is_closed()]:
+                        del _LOOP_CLIENTS[stale]
+                    _LOOP_CLIENTS[loop] = entry
+    return entry[0]
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, errors.APIError):
+        return exc.code in _TRANSIENT_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    return min(cap, base * 2**attempt) * random.uniform(0.5, 1.5)
+
+
+def retry_sync(fn, *, attempts: int = 5, base: float = 0.5, cap: float = 8.0):
+    """
+    Call fn(), retrying rate limits, 5xx and connection errors.
+
+    Blocking counterpart of with_retry for the client.models paths.
+
+    Args:
+        fn: Zero-argument callable performing the request
+        attempts: Maximum number of attempts
+        base: Initial backoff in seconds
+        cap: Maximum backoff in seconds
+
+    Returns:
+        The result of the first successful attempt
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except (errors.APIError, httpx.TransportError) as exc:
+            if not _is_transient(exc) or attempt == attempts - 1:
+                raise
+            time.sleep(_backoff(attempt, base, cap))
+
+
+async def with_retry(
+    coro_factory, *, attempts: int = 5, base: float = 0.5, cap: float = 8.0
+):
+    """
+    Await coro_factory(), retrying rate limits, 5xx and connection errors.
+
+    Backoff sleeps on the event loop, so other requests keep running while a
+    retry waits.
+
+    Args:
+        coro_factory: Zero-argument callable returning a fresh awaitable
+        attempts: Maximum number of attempts
+        base: Initial backoff in seconds
+        cap: Maximum backoff in seconds
+
+    Returns:
+        The result of the first successful attempt
+    """
+    for attempt in range(attempts):
+        try:
+            return await coro_factory()
+        except (errors.APIError, httpx.TransportError) as exc:
+            if not _is_transient(exc) or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(_backoff(attempt, base, cap))
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    if _LOOP is None:
+        with _LOOP_LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                _LOOP = loop
+    return _LOOP
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on a shared background event loop and wait for the result.
+
+    Sync wrappers share one long-lived loop, and with it one client (see
+    get_client), instead of calling asyncio.run and building a new pool
+    each time.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Shared image preparation for the example scripts.
+Decodes, downscales and JPEG-encodes images once per file version.
+"""
+
+import functools
+import io
+import os
+from PIL import Image
+from google.genai import types
+
+# libjpeg-turbo decodes JPEGs faster than Pillow's bundled libjpeg and can
+# downscale by 1/2 during decode. Optional: pip install PyTurboJPEG.
+try:
+    from turbojpeg import TJCS_CMYK, TJCS_YCCK, TJPF_RGB, TurboJPEG
+
+    _TJ = TurboJPEG()
+except Exception:
+    _TJ = None
+
+
+def _decode_turbo(path: str, max_side: int | None) -> Image.Image | None:
+    """Decode with libjpeg-turbo, or return None to let Pillow handle the file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        width, height, _, colorspace = _TJ.decode_header(data)
+        # libjpeg-turbo cannot convert CMYK/YCCK to RGB; Pillow can.
+        if colorspace in (TJCS_CMYK, TJCS_YCCK):
+            return None
+        # Halve during decode only when the result is still at least max_side.
+        big = max_side is not None and max(width, height) >= 2 * max_side
+        array = _TJ.decode(
+            data,
+            pixel_format=TJPF_RGB,
+            scaling_factor=(1, 2) if big else (1, 1),
+        )
+    except Exception:
+        # Mislabelled files (e.g. PNG named .jpg) and 12-bit JPEGs.
+        return None
+    return Image.fromarray(array)
+
+
+def open_image(path: str, max_side: int | None = None) -> Image.Image:
+    """Open and fully decode an image so the work happens on the calling thread."""
+    if _TJ is not None and path.lower().endswith((".jpg", ".jpeg")):
+        image = _decode_turbo(path, max_side)
+        if image is not None:
+            return image
+
+    image = Image.open(path)
+    image.load()
+    return image
+
+
+def prepare_image(image: Image.Image, max_side: int = 1024) -> Image.Image:
+    """Downscale to at most max_side pixels and drop alpha before upload."""
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+@functools.lru_cache(maxsize=64)
+def _prepared_bytes(path: str, mtime_ns: int, max_side: int) -> bytes:
+    """Decode, downscale and JPEG-encode an image; cached per file version."""
+    buffer = io.BytesIO()
+    image = prepare_image(open_image(path, max_side), max_side)
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def image_bytes(path: str, max_side: int = 1024) -> bytes:
+    """Return prepared JPEG bytes for the current version of the file."""
+    path = os.path.realpath(path)
+    return _prepared_bytes(path, os.stat(path).st_mtime_ns, max_side)
+
+
+def image_part(path: str, max_side: int = 1024) -> types.Part:
+    """Build an inline JPEG part so the SDK does not re-serialize the image."""
+    data = image_bytes(path, max_side)
+    return types.Part.from_bytes(data=data, mime_type="image/jpeg")
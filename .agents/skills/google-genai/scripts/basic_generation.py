@@ -4,8 +4,9 @@ Basic text generation example using Google GenAI SDK.
 Demonstrates simple text generation with the Gemini API.
 """
 
-import os
-from google import genai
+import asyncio
+from _cache import cache_enabled, cache_get, cache_put
+from _client import get_client, retry_sync, run_sync, with_retry
 
 
 def generate_text(prompt: str, model_name: str = "gemini-2.5-flash") -> str:
@@ -19,16 +20,82 @@ def generate_text(prompt: str, model_name: str = "gemini-2.5-flash") -> str:
     Returns:
         Generated text
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
+    use_cache = cache_enabled()
+    key = (model_name, prompt)
+    if use_cache:
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
 
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(model=model_name, contents=prompt)
+    client = get_client()
+    response = retry_sync(
+        lambda: client.models.generate_content(model=model_name, contents=prompt)
+    )
 
+    if use_cache and response.text is not None:
+        cache_put(key, response.text)
     return response.text
 
 
+async def generate_text_many(
+    prompts: list[str], model_name: str = "gemini-2.5-flash"
+) -> list[str]:
+    """
+    Generate text for several independent prompts concurrently.
+
+    Args:
+        prompts: The input prompts
+        model_name: Model to use (default: gemini-2.5-flash)
+
+    Returns:
+        Generated text for each prompt, in input order
+    """
+    use_cache = cache_enabled()
+    results = [
+        cache_get((model_name, prompt)) if use_cache else None for prompt in prompts
+    ]
+    misses = [i for i, text in enumerate(results) if text is None]
+    if not misses:
+        return results
+
+    client = get_client()
+    responses = await asyncio.gather(
+        *(
+            with_retry(
+                lambda prompt=prompts[i]: client.aio.models.generate_content(
+                    model=model_name, contents=prompt
+                )
+            )
+            for i in misses
+        )
+    )
+
+    for i, response in zip(misses, responses):
+        results[i] = response.text
+        if use_cache and response.text is not None:
+            cache_put((model_name, prompts[i]), response.text)
+    return results
+
+
+def generate_text_batch(
+    prompts: list[str], model_name: str = "gemini-2.5-flash"
+) -> list[str]:
+    """
+    Synchronous wrapper around generate_text_many.
+
+    Use this instead of `[generate_text(p) for p in prompts]` so the requests
+    run concurrently rather than one round-trip at a time.
+
+    Args:
+        prompts: The input prompts
+        model_name: Model to use (default: gemini-2.5-flash)
+
+    Returns:
+        Generated text for each prompt, in input order
+    """
+    return run_sync(generate_text_many(prompts, model_name))
+
+
 if __name__ == "__main__":
     prompt = "Explain quantum computing in simple terms."
     result = generate_text(prompt)
@@ -4,25 +4,22 @@ Function calling example using Google GenAI SDK.
 Demonstrates how to use function calling for structured data extraction.
 """
 
+import functools
 import json
-import os
-from google import genai
 from google.genai import types
-
-
-def get_client() -> genai.Client:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
-    return genai.Client(api_key=api_key)
+from _client import get_client, retry_sync
 
 
 def find_function_call(response):
-    for candidate in response.candidates:
-        for part in candidate.content.parts:
-            if part.function_call:
-                return part.function_call
-    return None
+    return next(
+        (
+            part.function_call
+            for candidate in response.candidates
+            for part in candidate.content.parts
+            if part.function_call
+        ),
+        None,
+    )
 
 
 get_weather_declaration = {
@@ -45,26 +42,15 @@ get_weather_declaration = {
     },
 }
 
+weather_tools = types.Tool(function_declarations=[get_weather_declaration])
+weather_config = types.GenerateContentConfig(tools=[weather_tools])
 
-def extract_structured_data(
-    text: str,
-    schema: dict,
-    model_name: str = "gemini-2.5-flash",
-) -> dict:
-    """
-    Extract structured data from text using function calling.
 
-    Args:
-        text: Input text to extract data from
-        schema: JSON schema defining the structure to extract
-        model_name: Model to use
-
-    Returns:
-        Extracted structured data
-    """
-    client = get_client()
-
-    function_decl = {
+@functools.lru_cache(maxsize=256)
+def _decl_for(schema_json: str) -> dict:
+    """Build the extraction function declaration once per distinct schema."""
+    schema = json.loads(schema_json)
+    return {
         "name": "extract_data",
         "description": "Extract structured data from text",
         "parameters": {
@@ -80,13 +66,42 @@ def extract_structured_data(
         },
     }
 
-    tools = types.Tool(function_declarations=[function_decl])
+
+@functools.lru_cache(maxsize=128)
+def _build_tool_config(
+    schema_json: str,
+) -> tuple[types.Tool, types.GenerateContentConfig]:
+    """Build the extraction tool and config once per distinct schema."""
+    tools = types.Tool(function_declarations=[_decl_for(schema_json)])
     config = types.GenerateContentConfig(tools=[tools])
+    return tools, config
 
-    response = client.models.generate_content(
-        model=model_name,
-        contents=text,
-        config=config,
+
+def extract_structured_data(
+    text: str,
+    schema: dict,
+    model_name: str = "gemini-2.5-flash",
+) -> dict:
+    """
+    Extract structured data from text using function calling.
+
+    Args:
+        text: Input text to extract data from
+        schema: JSON schema defining the structure to extract
+        model_name: Model to use
+
+    Returns:
+        Extracted structured data
+    """
+    client = get_client()
+    _, config = _build_tool_config(json.dumps(schema, sort_keys=True))
+
+    response = retry_sync(
+        lambda: client.models.generate_content(
+            model=model_name,
+            contents=text,
+            config=config,
+        )
     )
 
     function_call = find_function_call(response)
@@ -106,14 +121,13 @@ def function_calling_flow(prompt: str, model_name: str = "gemini-2.5-flash"):
     """
     client = get_client()
 
-    tools = types.Tool(function_declarations=[get_weather_declaration])
-    config = types.GenerateContentConfig(tools=[tools])
-
     contents = [types.Content(role="user", parts=[types.Part(text=prompt)])]
-    response = client.models.generate_content(
-        model=model_name,
-        contents=contents,
-        config=config,
+    response = retry_sync(
+        lambda: client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=weather_config,
+        )
     )
 
     function_call = find_function_call(response)
@@ -138,10 +152,12 @@ def function_calling_flow(prompt: str, model_name: str = "gemini-2.5-flash"):
     contents.append(response.candidates[0].content)
     contents.append(types.Content(role="user", parts=[function_response_part]))
 
-    final_response = client.models.generate_content(
-        model=model_name,
-        contents=contents,
-        config=config,
+    final_response = retry_sync(
+        lambda: client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=weather_config,
+        )
     )
 
     print(f"\nFinal response: {final_response.text}")
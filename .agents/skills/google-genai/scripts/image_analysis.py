@@ -4,15 +4,41 @@ Image analysis example using Google GenAI SDK.
 Demonstrates multimodal capabilities with image input.
 """
 
+import asyncio
+import io
 import os
-from PIL import Image
-from google import genai
+import PIL
+from google.genai import types
+from _client import get_client, retry_sync, run_sync, with_retry
+from _images import image_bytes, image_part
+
+# Resize/convert dominate CPU time here; Pillow-SIMD speeds both up. Set
+# MECHAT_REQUIRE_SIMD=1 to fail fast if stock Pillow got reinstalled.
+if os.getenv("MECHAT_REQUIRE_SIMD") == "1" and not (
+    "post" in PIL.__version__ or "simd" in PIL.__version__.lower()
+):
+    raise RuntimeError(
+        f"MECHAT_REQUIRE_SIMD is set but Pillow {PIL.__version__} is installed; "
+        "install pillow-simd instead"
+    )
+
+
+async def _upload_image(client, path: str, max_side: int) -> types.File:
+    """Prepare an image off the event loop and upload it via the Files API."""
+    data = await asyncio.to_thread(image_bytes, path, max_side)
+    return await with_retry(
+        lambda: client.aio.files.upload(
+            file=io.BytesIO(data),
+            config=types.UploadFileConfig(mime_type="image/jpeg"),
+        )
+    )
 
 
 def analyze_image(
     image_path: str,
     prompt: str = "Describe this image in detail.",
     model_name: str = "gemini-2.5-flash",
+    max_side: int = 1024,
 ) -> str:
     """
     Analyze an image using Gemini API.
@@ -21,57 +47,97 @@ def analyze_image(
         image_path: Path to the image file
         prompt: Custom prompt for image analysis
         model_name: Model to use (default: gemini-2.5-flash)
+        max_side: Longest image side sent to the API (default: 1024)
 
     Returns:
         Analysis result
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
-
-    client = genai.Client(api_key=api_key)
-    image = Image.open(image_path)
-
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[image, prompt],
+    client = get_client()
+    part = image_part(image_path, max_side)
+
+    response = retry_sync(
+        lambda: client.models.generate_content(
+            model=model_name,
+            contents=[part, prompt],
+        )
     )
 
     return response.text
 
 
-def analyze_multiple_images(
+async def analyze_multiple_images_async(
     image_paths: list[str],
     prompt: str,
     model_name: str = "gemini-2.5-flash",
+    max_side: int = 768,
 ) -> str:
     """
     Analyze multiple images together using Gemini API.
 
+    Images are prepared and uploaded concurrently, then referenced by file
+    URI, so the generate request stays small however many images there are.
+
     Args:
         image_paths: List of paths to image files
         prompt: Prompt for multi-image analysis
         model_name: Model to use
+        max_side: Longest side of each image sent to the API (default: 768)
 
     Returns:
         Analysis result
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
-
-    client = genai.Client(api_key=api_key)
-    images = [Image.open(path) for path in image_paths]
-
-    contents = images + [prompt]
-    response = client.models.generate_content(
-        model=model_name,
-        contents=contents,
+    client = get_client()
+    uploads = await asyncio.gather(
+        *(_upload_image(client, path, max_side) for path in image_paths),
+        return_exceptions=True,
     )
+    files = [upload for upload in uploads if not isinstance(upload, BaseException)]
+
+    try:
+        for upload in uploads:
+            if isinstance(upload, BaseException):
+                raise upload
+
+        contents = [*files, prompt]
+        response = await with_retry(
+            lambda: client.aio.models.generate_content(
+                model=model_name,
+                contents=contents,
+            )
+        )
+    finally:
+        # Uploaded files otherwise linger in Files API storage for 48h.
+        await asyncio.gather(
+            *(client.aio.files.delete(name=file.name) for file in files),
+            return_exceptions=True,
+        )
 
     return response.text
 
 
+def analyze_multiple_images(
+    image_paths: list[str],
+    prompt: str,
+    model_name: str = "gemini-2.5-flash",
+    max_side: int = 768,
+) -> str:
+    """
+    Synchronous wrapper around analyze_multiple_images_async.
+
+    Args:
+        image_paths: List of paths to image files
+        prompt: Prompt for multi-image analysis
+        model_name: Model to use
+        max_side: Longest side of each image sent to the API (default: 768)
+
+    Returns:
+        Analysis result
+    """
+    return run_sync(
+        analyze_multiple_images_async(image_paths, prompt, model_name, max_side)
+    )
+
+
 if __name__ == "__main__":
     import sys
 
@@ -4,9 +4,10 @@ Multimodal chat example using Google GenAI SDK.
 Demonstrates chat with text, images, and other modalities.
 """
 
-import os
-from PIL import Image
-from google import genai
+import json
+from google.genai import types
+from _client import get_client
+from _images import image_part
 
 
 def multimodal_chat_session(model_name: str = "gemini-2.5-flash"):
@@ -16,25 +17,63 @@ def multimodal_chat_session(model_name: str = "gemini-2.5-flash"):
     Args:
         model_name: Model to use
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
-
-    client = genai.Client(api_key=api_key)
+    client = get_client()
     return client.chats.create(model=model_name)
 
 
+def async_multimodal_chat_session(model_name: str = "gemini-2.5-flash"):
+    """
+    Create a chat session for use with the async helpers.
+
+    Call this from within the event loop that will use the chat, so it gets
+    that loop's client.
+
+    Args:
+        model_name: Model to use
+    """
+    client = get_client()
+    return client.aio.chats.create(model=model_name)
+
+
+def send_text_message_stream(chat, message: str):
+    """Send a text message in the chat and yield the reply as it streams."""
+    for chunk in chat.send_message_stream(message):
+        if chunk.text:
+            yield chunk.text
+
+
+def send_image_message_stream(chat, image_path: str, message: str):
+    """Send a message with an image in the chat and yield the reply as it streams."""
+    part = image_part(image_path)
+    for chunk in chat.send_message_stream([part, message]):
+        if chunk.text:
+            yield chunk.text
+
+
+async def send_text_message_async_stream(chat, message: str):
+    """Async variant of send_text_message_stream for async chat sessions."""
+    async for chunk in await chat.send_message_stream(message):
+        if chunk.text:
+            yield chunk.text
+
+
 def send_text_message(chat, message: str) -> str:
     """Send a text message in the chat."""
-    response = chat.send_message(message)
-    return response.text
+    return "".join(send_text_message_stream(chat, message))
 
 
 def send_image_message(chat, image_path: str, message: str) -> str:
     """Send a message with an image in the chat."""
-    image = Image.open(image_path)
-    response = chat.send_message([image, message])
-    return response.text
+    return "".join(send_image_message_stream(chat, image_path, message))
+
+
+def _first_text(parts) -> str | None:
+    """Return the first non-empty text part, if any."""
+    for part in parts or ():
+        text = part.text
+        if text:
+            return text
+    return None
 
 
 def get_chat_history(chat):
@@ -42,6 +81,59 @@ def get_chat_history(chat):
     return chat.get_history()
 
 
+def save_chat(chat, path: str) -> None:
+    """Snapshot the chat history to a JSON file."""
+    history = [
+        message.model_dump(mode="json", exclude_none=True)
+        for message in chat.get_history()
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f)
+
+
+def load_chat(
+    path: str,
+    model_name: str = "gemini-2.5-flash",
+    config: types.GenerateContentConfig | None = None,
+):
+    """Recreate a chat session from a history saved with save_chat."""
+    with open(path, encoding="utf-8") as f:
+        history = [types.Content.model_validate(message) for message in json.load(f)]
+
+    client = get_client()
+    return client.chats.create(model=model_name, config=config, history=history)
+
+
+def trim_history(
+    chat,
+    model_name: str,
+    k_turns: int = 20,
+    config: types.GenerateContentConfig | None = None,
+):
+    """
+    Recreate the chat keeping only the most recent exchanges.
+
+    Every send_message call ships the whole history, so long sessions grow
+    quadratically in tokens; trimming bounds the context sent per turn.
+
+    Args:
+        chat: Chat session to trim
+        model_name: Model the chat was created with
+        k_turns: Number of user/model exchanges to keep
+        config: Config the chat was created with (system instruction, tools, ...)
+
+    Returns:
+        A new chat session seeded with the trimmed history
+    """
+    history = chat.get_history()[-2 * k_turns :] if k_turns > 0 else []
+    # The history must open with a user message.
+    while history and history[0].role != "user":
+        history = history[1:]
+
+    client = get_client()
+    return client.chats.create(model=model_name, config=config, history=history)
+
+
 if __name__ == "__main__":
     print("Starting multimodal chat session...")
     chat = multimodal_chat_session()
@@ -59,6 +151,5 @@ if __name__ == "__main__":
     print("\n--- Chat History ---")
     for message in get_chat_history(chat):
         role = "User" if message.role == "user" else "AI"
-        text_part = next((part.text for part in message.parts if part.text), None)
-        content = text_part if text_part else "[Image/Media]"
+        content = _first_text(message.parts) or "[Image/Media]"
         print(f"{role}: {content}")
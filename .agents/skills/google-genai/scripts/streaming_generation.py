@@ -4,41 +4,151 @@ Streaming text generation example using Google GenAI SDK.
 Demonstrates how to stream responses for real-time output.
 """
 
-import os
-from google import genai
+import asyncio
+import sys
+import threading
+from _cache import cache_enabled, cache_get, cache_put
+from _client import get_client, run_sync, with_retry
 
 
-def stream_text(prompt: str, model_name: str = "gemini-2.5-flash"):
+async def stream_text_async(
+    prompt: str,
+    model_name: str = "gemini-2.5-flash",
+    smooth: bool = True,
+    max_chunk_chars: int = 50,
+    sub_chunk_chars: int = 4,
+    delay_s: float = 0.02,
+):
     """
-    Stream text generation using Gemini API.
+    Stream text generation using Gemini API without blocking the event loop.
 
     Args:
         prompt: The input prompt
         model_name: Model to use (default: gemini-2.5-flash)
+        smooth: Re-chunk oversized chunks into small, evenly paced pieces
+        max_chunk_chars: Chunks longer than this are re-chunked when smoothing
+        sub_chunk_chars: Size of each re-chunked piece
+        delay_s: Pause between re-chunked pieces
 
     Yields:
         Text chunks as they are generated
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
+    use_cache = cache_enabled()
+    key = (model_name, prompt)
+    if use_cache:
+        cached = cache_get(key)
+        if cached is not None:
+            if not smooth:
+                yield cached
+                return
+            for i in range(0, len(cached), sub_chunk_chars):
+                yield cached[i : i + sub_chunk_chars]
+                await asyncio.sleep(delay_s)
+            return
 
-    client = genai.Client(api_key=api_key)
+    client = get_client()
 
-    stream = client.models.generate_content_stream(
-        model=model_name,
-        contents=prompt,
-    )
+    async def open_stream():
+        stream = await client.aio.models.generate_content_stream(
+            model=model_name,
+            contents=prompt,
+        )
+        try:
+            return stream, await stream.__anext__()
+        except StopAsyncIteration:
+            return stream, None
+
+    # The request is only sent when the stream is first iterated, so retry up
+    # to the first chunk; once text has been yielded a retry would repeat it.
+    stream, first = await with_retry(open_stream)
+
+    async def chunks():
+        if first is None:
+            return
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+    parts = []
+    async for chunk in chunks():
+        text = chunk.text
+        if not text:
+            continue
+        if use_cache:
+            parts.append(text)
+        if smooth and len(text) > max_chunk_chars:
+            for i in range(0, len(text), sub_chunk_chars):
+                yield text[i : i + sub_chunk_chars]
+                await asyncio.sleep(delay_s)
+        else:
+            yield text
+
+    if use_cache:
+        cache_put(key, "".join(parts))
 
-    for chunk in stream:
-        if chunk.text:
-            yield chunk.text
+
+def stream_text(
+    prompt: str,
+    model_name: str = "gemini-2.5-flash",
+    smooth: bool = True,
+    max_chunk_chars: int = 50,
+    sub_chunk_chars: int = 4,
+    delay_s: float = 0.02,
+):
+    """
+    Synchronous wrapper around stream_text_async for CLI use.
+
+    Library callers running inside an event loop should use
+    stream_text_async directly.
+
+    Args:
+        prompt: The input prompt
+        model_name: Model to use (default: gemini-2.5-flash)
+        smooth: Re-chunk oversized chunks into small, evenly paced pieces
+        max_chunk_chars: Chunks longer than this are re-chunked when smoothing
+        sub_chunk_chars: Size of each re-chunked piece
+        delay_s: Pause between re-chunked pieces
+
+    Yields:
+        Text chunks as they are generated
+    """
+    stream = stream_text_async(
+        prompt,
+        model_name,
+        smooth=smooth,
+        max_chunk_chars=max_chunk_chars,
+        sub_chunk_chars=sub_chunk_chars,
+        delay_s=delay_s,
+    )
+    try:
+        while True:
+            try:
+                yield run_sync(stream.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        run_sync(stream.aclose())
 
 
 if __name__ == "__main__":
     prompt = "Write a short story about a robot learning to paint."
 
-    print("Streaming response:")
-    for chunk in stream_text(prompt):
-        print(chunk, end="", flush=True)
-    print("\n")
+    print("Streaming response:", flush=True)
+    # Flush every 50ms from a side thread instead of once per (possibly tiny)
+    # chunk; text written just before a pause still shows up within 50ms.
+    # Flushing an empty buffer does not hit the OS.
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.wait(0.05):
+            sys.stdout.flush()
+
+    flush_thread = threading.Thread(target=flusher, daemon=True)
+    flush_thread.start()
+    try:
+        for chunk in stream_text(prompt):
+            sys.stdout.write(chunk)
+    finally:
+        stop.set()
+        flush_thread.join()
+    print("\n", flush=True)